@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Caché local de consultas Athena para los notebooks de análisis (schemas waze y gtfs).
+
+Cada resultado se guarda como Parquet particionado en
+``{cache_dir}/{schema}/{hash}/part-*.parquet``, donde ``hash`` es el SHA-256 del
+SQL normalizado. Las consultas repetidas se sirven localmente con DuckDB (o pandas
+si DuckDB no está instalado) sin volver a escanear Athena.
+
+Uso:
+    from athena_cache import AthenaCache
+    cache = AthenaCache(conn, ttl_hours=24, max_size_mb=2048)
+    df = cache.read_sql("SELECT * FROM routes", schema="gtfs")
+
+    # Tests / sin credenciales: solo sirve lo que ya está en caché
+    cache = AthenaCache(offline=True)
+"""
+
+import hashlib
+import json
+import re
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:  # DuckDB es opcional, pandas sirve como respaldo
+    duckdb = None
+
+DEFAULT_CACHE_DIR = Path("./data/athena_cache")
+MANIFEST = "manifest.json"
+ROWS_PER_PART = 500_000
+
+# Literales entre comillas simples/dobles o cualquier otro carácter
+_SQL_TOKEN = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|(--[^\n]*|/\*.*?\*/)|(\s+)", re.S)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Normaliza una consulta para que variaciones triviales compartan entrada en caché:
+    elimina comentarios, colapsa espacios y el ';' final, y pasa a minúsculas todo
+    lo que no esté entre comillas.
+    """
+    parts = []
+    code = ""
+    pos = 0
+    for m in _SQL_TOKEN.finditer(sql):
+        code += sql[pos:m.start()].lower()
+        literal = m.group(1)
+        if literal:
+            parts.append(re.sub(r" +", " ", code))
+            parts.append(literal)
+            code = ""
+        else:
+            code += " "
+        pos = m.end()
+    code += sql[pos:].lower()
+    parts.append(re.sub(r" +", " ", code))
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def query_key(sql: str, schema: str = "") -> str:
+    return hashlib.sha256(f"{schema}\n{normalize_sql(sql)}".encode("utf-8")).hexdigest()[:24]
+
+
+class AthenaCache:
+    """
+    Lector de Athena con caché Parquet local, TTL y evicción por tamaño (LRU).
+
+    Parameters
+    ----------
+    conn : pyathena.Connection, optional
+        Conexión a Athena. No se usa en modo offline.
+    cache_dir : str or Path
+        Carpeta raíz de la caché.
+    ttl_hours : float, optional
+        Horas que un resultado se considera vigente. None = sin expiración.
+    max_size_mb : float, optional
+        Tamaño máximo de la caché; se eliminan primero las entradas usadas hace más tiempo.
+    offline : bool
+        Si es True nunca consulta Athena: sirve la caché (aunque esté vencida) y
+        lanza KeyError si la consulta no fue registrada antes. Requiere indicar
+        `schema` en cada consulta.
+    """
+
+    def __init__(self, conn=None, cache_dir=DEFAULT_CACHE_DIR, ttl_hours=24,
+                 max_size_mb=2048, offline=False):
+        if conn is None and not offline:
+            raise ValueError("Se requiere una conexión a Athena o offline=True")
+        self.conn = conn
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl_hours * 3600 if ttl_hours is not None else None
+        self.max_bytes = max_size_mb * 1024 * 1024 if max_size_mb is not None else None
+        self.offline = offline
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---------- API pública ----------
+
+    def read_sql(self, sql: str, schema: str = "", refresh: bool = False) -> pd.DataFrame:
+        """
+        Devuelve el resultado de `sql` desde la caché si está vigente; si no,
+        lo consulta en Athena y lo guarda.
+        """
+        schema = self._resolve_schema(schema)
+        entry = self._entry_dir(sql, schema)
+        manifest = self._load_manifest(entry)
+
+        if manifest and (self.offline or (not refresh and not self._expired(manifest))):
+            self._touch(entry, manifest)
+            return self._read_entry(entry)
+
+        if self.offline:
+            raise KeyError(f"Consulta no registrada en la caché offline: {normalize_sql(sql)[:80]}")
+
+        df = self._query_athena(sql, schema)
+        self._write_entry(entry, df, sql, schema)
+        self.evict()
+        # Se relee desde Parquet para que hit y miss devuelvan los mismos dtypes
+        return self._read_entry(entry)
+
+    def query_local(self, sql: str, **tables) -> pd.DataFrame:
+        """
+        Ejecuta SQL de DuckDB sobre resultados ya cacheados, registrados como vistas.
+
+        Ejemplo:
+            cache.query_local("SELECT count(*) FROM r", r=("SELECT * FROM routes", "gtfs"))
+        """
+        if duckdb is None:
+            raise RuntimeError("query_local requiere duckdb instalado")
+        con = duckdb.connect()
+        try:
+            for name, (table_sql, schema) in tables.items():
+                schema = self._resolve_schema(schema)
+                self.read_sql(table_sql, schema=schema)
+                pattern = str(self._entry_dir(table_sql, schema) / "part-*.parquet")
+                con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{pattern}')")
+            return con.execute(sql).df()
+        finally:
+            con.close()
+
+    def evict(self):
+        """
+        Elimina entradas vencidas y, si la caché supera `max_size_mb`, las menos
+        usadas recientemente hasta volver bajo el límite.
+        """
+        entries = []
+        for manifest_path in self.cache_dir.glob(f"*/*/{MANIFEST}"):
+            entry = manifest_path.parent
+            manifest = self._load_manifest(entry)
+            if manifest is None:
+                continue
+            if not self.offline and self._expired(manifest):
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            entries.append((manifest.get("last_access", 0), manifest.get("bytes", 0), entry))
+
+        if self.max_bytes is None:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---------- internos ----------
+
+    def _resolve_schema(self, schema):
+        """
+        Sin schema explícito se usa el schema por defecto de la conexión, para que la
+        misma consulta sobre schemas distintos no comparta entrada en caché.
+        """
+        if schema:
+            return schema
+        if self.offline:
+            raise ValueError("En modo offline se debe indicar el schema de la consulta")
+        return getattr(self.conn, "schema_name", "") or ""
+
+    def _entry_dir(self, sql, schema):
+        return self.cache_dir / (schema or "default") / query_key(sql, schema)
+
+    def _expired(self, manifest):
+        return self.ttl is not None and time.time() - manifest["created_at"] > self.ttl
+
+    def _load_manifest(self, entry):
+        path = entry / MANIFEST
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _save_manifest(self, entry, manifest):
+        tmp = entry / f"{MANIFEST}.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        tmp.replace(entry / MANIFEST)
+
+    def _touch(self, entry, manifest):
+        manifest["last_access"] = time.time()
+        self._save_manifest(entry, manifest)
+
+    def _query_athena(self, sql, schema):
+        cursor = self.conn.cursor(schema_name=schema) if schema else self.conn.cursor()
+        try:
+            cursor.execute(sql)
+            columns = [c[0] for c in cursor.description]
+            return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+        finally:
+            cursor.close()
+
+    def _read_entry(self, entry):
+        parts = sorted(entry.glob("part-*.parquet"))
+        if duckdb is not None:
+            pattern = str(entry / "part-*.parquet")
+            return duckdb.query(f"SELECT * FROM read_parquet('{pattern}')").df()
+        return pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+
+    def _write_entry(self, entry, df, sql, schema):
+        if entry.exists():
+            shutil.rmtree(entry)
+        entry.mkdir(parents=True)
+        n_parts = max(1, -(-len(df) // ROWS_PER_PART))
+        for i in range(n_parts):
+            chunk = df.iloc[i * ROWS_PER_PART:(i + 1) * ROWS_PER_PART]
+            chunk.to_parquet(entry / f"part-{i:05d}.parquet", index=False)
+
+        now = time.time()
+        self._save_manifest(entry, {
+            "sql": normalize_sql(sql),
+            "schema": schema,
+            "rows": len(df),
+            "parts": n_parts,
+            "bytes": sum(p.stat().st_size for p in entry.glob("part-*.parquet")),
+            "created_at": now,
+            "last_access": now,
+        })
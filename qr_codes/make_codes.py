@@ -1,5 +1,29 @@
+#!/usr/bin/env python3
+"""
+Genera códigos QR para el workshop.
+
+Sin argumentos genera un QR por perfil apuntando a /join/{perfil} (como siempre).
+Con --assignments lee el mapeo exportado por el pre-registro (CSV o Parquet con
+columnas profile, uuid y opcionalmente url), renderiza un QR por asistente en
+paralelo y arma hojas imprimibles en PDF multipágina por perfil.
+
+Las imágenes se cachean por hash de URL en ./codes/cache, así que re-ejecutar
+solo renderiza los códigos nuevos o modificados.
+
+Uso:
+    python make_codes.py
+    python make_codes.py --assignments ../urban_explore/pois_manager/data/student.csv
+"""
+
+import argparse
+import csv
+import hashlib
 import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import qrcode
+from PIL import Image, ImageDraw
 
 # List of profiles (replace with your actual profile names or IDs)
 profiles = [
@@ -15,20 +39,147 @@ profiles = [
 base_url = "https://mobility-concepcion-workshop.up.railway.app"
 
 # Output directory for QR codes
-output_dir = "./codes"
-os.makedirs(output_dir, exist_ok=True)
+output_dir = Path("./codes")
+cache_dir = output_dir / "cache"
+sheets_dir = output_dir / "sheets"
+
+QR_OPTIONS = {"box_size": 10, "border": 4}
+
+# A4 a 150 dpi
+PAGE_SIZE = (1240, 1754)
+PAGE_MARGIN = 60
+GRID = (3, 4)  # columnas, filas
+CAPTION_HEIGHT = 40
+
 
-for profile in profiles:
-    url = f"{base_url}/join/{profile}"
+def make_qr_image(url):
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
+        box_size=QR_OPTIONS["box_size"],
+        border=QR_OPTIONS["border"],
     )
     qr.add_data(url)
     qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    img.save(os.path.join(output_dir, f"{profile}.png"))
+    return qr.make_image(fill_color="black", back_color="white")
+
+
+def cache_path(url):
+    """Ruta en caché del QR de una URL (incluye las opciones de render en el hash)."""
+    key = f"{url}|{QR_OPTIONS['box_size']}|{QR_OPTIONS['border']}"
+    return cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:20]}.png"
+
+
+def render_cached(url):
+    """Renderiza el QR de `url` si no está en caché. Se ejecuta en los workers."""
+    path = cache_path(url)
+    if not path.exists():
+        tmp = path.with_suffix(".tmp.png")
+        make_qr_image(url).save(tmp)
+        os.replace(tmp, path)
+    return path
+
+
+def render_all(urls, workers=None):
+    """
+    Renderiza en paralelo los QR que faltan en caché y devuelve {url: ruta}.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    unique_urls = list(dict.fromkeys(urls))
+    missing = [u for u in unique_urls if not cache_path(u).exists()]
+    print(f"🔎 {len(unique_urls)} QR únicos, {len(missing)} por renderizar")
+
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(missing) // ((workers or os.cpu_count() or 1) * 4))
+            for _ in pool.map(render_cached, missing, chunksize=chunksize):
+                pass
+    return {u: cache_path(u) for u in unique_urls}
+
+
+def read_assignments(path):
+    """
+    Lee el mapeo de asistentes (CSV o Parquet) y devuelve una lista de dicts
+    con profile, uuid y url.
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pandas as pd
+        # fillna para que las celdas vacías lleguen como "" igual que desde CSV
+        rows = pd.read_parquet(path).fillna("").to_dict("records")
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+    for row in rows:
+        url = row.get("url")
+        if not isinstance(url, str) or not url.strip():
+            row["url"] = f"{base_url}/viewer/{row['profile']}/{row['uuid']}"
+    return rows
+
+
+def build_sheets(rows, images, output_file):
+    """
+    Distribuye los QR en una grilla sobre páginas A4 y guarda un PDF multipágina.
+    """
+    cols, nrows = GRID
+    cell_w = (PAGE_SIZE[0] - 2 * PAGE_MARGIN) // cols
+    cell_h = (PAGE_SIZE[1] - 2 * PAGE_MARGIN) // nrows
+    qr_side = min(cell_w, cell_h - CAPTION_HEIGHT)
+    per_page = cols * nrows
+
+    # Páginas en modo "1" (bilevel): ~24x menos memoria que RGB y Pillow las
+    # guarda en el PDF sin pérdida, en vez de JPEG
+    pages = []
+    for start in range(0, len(rows), per_page):
+        page = Image.new("1", PAGE_SIZE, 1)
+        draw = ImageDraw.Draw(page)
+        for slot, row in enumerate(rows[start:start + per_page]):
+            x = PAGE_MARGIN + (slot % cols) * cell_w
+            y = PAGE_MARGIN + (slot // cols) * cell_h
+            with Image.open(images[row["url"]]) as img:
+                qr_img = img.convert("1").resize((qr_side, qr_side), Image.NEAREST)
+            page.paste(qr_img, (x + (cell_w - qr_side) // 2, y))
+            draw.text((x + 10, y + qr_side + 5), f"{row['profile']} · {row['uuid']}", fill=0)
+        pages.append(page)
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    pages[0].save(output_file, save_all=True, append_images=pages[1:], resolution=150)
+    return len(pages)
+
+
+def make_profile_codes():
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for profile in profiles:
+        url = f"{base_url}/join/{profile}"
+        make_qr_image(url).save(output_dir / f"{profile}.png")
+    print(f"QR codes generated and saved in {output_dir}")
+
+
+def make_attendee_codes(assignments_path, workers=None):
+    rows = read_assignments(assignments_path)
+    if not rows:
+        raise SystemExit(f"❌ {assignments_path} no tiene asistentes")
+
+    images = render_all([row["url"] for row in rows], workers=workers)
+
+    by_profile = {}
+    for row in rows:
+        by_profile.setdefault(row["profile"], []).append(row)
+
+    for profile, profile_rows in by_profile.items():
+        output_file = sheets_dir / f"{profile}.pdf"
+        n_pages = build_sheets(profile_rows, images, output_file)
+        print(f"✅ {len(profile_rows)} QR de '{profile}' en {n_pages} páginas: {output_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera códigos QR por perfil o por asistente")
+    parser.add_argument("--assignments", type=Path, help="CSV/Parquet exportado por el pre-registro")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos para renderizar (default: CPUs)")
+    args = parser.parse_args()
 
-print("QR codes generated and saved in ./codes")
\ No newline at end of file
+    if args.assignments:
+        make_attendee_codes(args.assignments, workers=args.workers)
+    else:
+        make_profile_codes()
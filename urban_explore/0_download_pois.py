@@ -79,7 +79,7 @@ def extract_pois_from_polygon(polygon_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame
 
 if __name__ == "__main__":
     # 👉 Carga tu polígono
-    roi = gpd.read_file("./pois-manager/static/geometries/area_mobility_workshop.geojson")
+    roi = gpd.read_file("./pois_manager/static/geometries/area_mobility_workshop.geojson")
 
     pois_gdf = extract_pois_from_polygon(roi)
 
@@ -8,13 +8,16 @@ import osmnx as ox
 import geopandas as gpd
 import pandas as pd
 from pathlib import Path
+from pyogrio import read_info
+
+from schema import SOURCE_COLUMNS, narrow_schema, apply_schema, decategorize
 
 # =====================
 # CONFIGURACIÓN
 # =====================
 
 INPUT_POIS_FILE = "./data/pois.gpkg"
-INPUT_ROI_FILE = "./pois-manager/static/geometries/area_mobility_workshop.geojson"
+INPUT_ROI_FILE = "./pois_manager/static/geometries/area_mobility_workshop.geojson"
 OUTPUT_GPKG = "./data/pois_categorizados.gpkg"
 OUTPUT_GEOJSON = "./data/pois_categorizados.geojson"
 OUTPUT_PARQUET = "./data/pois_categorizados_filtrados.parquet"
@@ -94,8 +97,11 @@ def load_and_categorize_pois():
     Carga los POIs y les asigna categorías.
     """
     print("📥 Cargando POIs desde archivo GPKG...")
-    gdf = gpd.read_file(INPUT_POIS_FILE, layer="pois")
-    print(f"✅ Cargados {len(gdf)} POIs")
+    # Solo se leen los tags que se usan; el resto de columnas de OSMnx se descarta
+    fields = list(read_info(INPUT_POIS_FILE, layer="pois")["fields"])
+    columns = [c for c in SOURCE_COLUMNS if c in fields]
+    gdf = gpd.read_file(INPUT_POIS_FILE, layer="pois", columns=columns, engine="pyogrio")
+    print(f"✅ Cargados {len(gdf)} POIs ({len(columns)} de {len(fields)} columnas)")
     
     print("🏷️ Asignando categorías...")
     # Crear nueva columna de categoría
@@ -114,7 +120,7 @@ def load_and_categorize_pois():
     if uncategorized > 0:
         print(f"⚠️ POIs sin categoría: {uncategorized}")
     
-    return gdf
+    return narrow_schema(gdf)
 
 def filter_by_roi(gdf):
     """
@@ -149,6 +155,8 @@ def filter_by_roi(gdf):
     print("🔗 Combinando geometrías filtradas...")
     gdf_filtered = pd.concat([gdf_points_filtered, gdf_polygons_filtered], ignore_index=True)
     gdf_filtered = gpd.GeoDataFrame(gdf_filtered, geometry='geometry', crs=gdf.crs)
+    # El overlay agrega columnas del ROI y pierde los dtypes categóricos
+    gdf_filtered = apply_schema(gdf_filtered)
     
     print(f"✅ Total POIs filtrados: {len(gdf_filtered)}")
     return gdf_filtered
@@ -164,10 +172,11 @@ def export_results(gdf_categorized, gdf_filtered):
     
     # Exportar POIs categorizados (antes del filtrado geográfico)
     print(f"   📄 Exportando a {OUTPUT_GPKG}")
-    gdf_categorized.to_file(OUTPUT_GPKG, layer="pois", driver="GPKG")
+    gdf_vector = decategorize(gdf_categorized)
+    gdf_vector.to_file(OUTPUT_GPKG, layer="pois", driver="GPKG")
     
     print(f"   📄 Exportando a {OUTPUT_GEOJSON}")
-    gdf_categorized.to_file(OUTPUT_GEOJSON, driver="GeoJSON")
+    gdf_vector.to_file(OUTPUT_GEOJSON, driver="GeoJSON")
     
     # Exportar POIs filtrados (resultado final)
     print(f"   📄 Exportando resultado final a {OUTPUT_PARQUET}")
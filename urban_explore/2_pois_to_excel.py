@@ -1,21 +1,16 @@
-import geopandas as gpd
 import pandas as pd
 import os
 
+from schema import parquet_columns
+
 # Ruta de entrada y salida
 input_path = './data/pois_categorizados_filtrados.parquet'  # Ajusta si tu archivo tiene otro nombre o extensión
 output_path = './data/banned.xlsx'
 
-# Leer los datos de POIs
-gdf = gpd.read_parquet(input_path)
-
-# Seleccionar columnas útiles para identificar los POIs
-# Ajusta los nombres de columnas según tu archivo
-# cols_to_keep = ['name', 'category']
-# cols_present = [col for col in cols_to_keep if col in gdf.columns]
-# gdf_filtered = gdf[cols_present]
-gdf_filtered = gdf.copy()
-df = pd.DataFrame(gdf_filtered)
+# Solo las columnas útiles para identificar los POIs ('name' primero: 3_filter_pois.py lee la primera columna).
+# Sin geometría, así que basta pandas.
+cols_to_keep = ['name', 'category', 'main_category', 'tags']
+df = pd.read_parquet(input_path, columns=parquet_columns(input_path, cols_to_keep))
 # Guardar a Excel para filtrar manualmente
 os.makedirs('./data', exist_ok=True)
 df.to_excel(output_path, index=False)
@@ -1,30 +1,54 @@
 import pandas as pd
 import geopandas as gpd
+import os
+import shutil
+
+from schema import parquet_columns
 
 input_path = './data/pois_categorizados_filtrados.parquet'
 banned_path = './data/banned.xlsx'
 output_path = './data/pois_categorizados_filtrados_refinados.parquet'
+# La app carga este archivo en memoria para /api/pois
+app_data_path = './pois_manager/data/pois_categorizados_filtrados_refinados.parquet'
+
+
+def load_banned_names(path):
+    banned_df = pd.read_excel(path)
+    return set(banned_df.iloc[:, 0].dropna().astype(str).str.strip())
+
+
+def filter_banned(gdf, banned_names):
+    return gdf[~gdf['name'].astype(str).str.strip().isin(banned_names)]
+
+
+def main():
+    print("Leyendo datos principales...")
+    gdf = gpd.read_parquet(input_path, columns=parquet_columns(input_path))
+    print(f"Total de registros cargados: {len(gdf)}")
+
+    print("Leyendo lista de nombres baneados...")
+    banned_names = load_banned_names(banned_path)
+    print(f"Nombres baneados cargados: {len(banned_names)}")
+
+    # print("Filtrando registros sin nombre o vacíos...")
+    # before = len(gdf)
+    # gdf = gdf[gdf['name'].notna() & (gdf['name'].str.strip() != '')]
+    # print(f"Registros eliminados por nombre vacío: {before - len(gdf)}")
+
+    print("Filtrando registros con nombres baneados...")
+    before = len(gdf)
+    gdf = filter_banned(gdf, banned_names)
+    print(f"Registros eliminados por estar en la lista de baneo: {before - len(gdf)}")
+
+    print(f"Total de registros finales: {len(gdf)}")
+    print("Guardando resultado...")
+    gdf.to_parquet(output_path, index=False)
+    print(f"Archivo guardado en: {output_path}")
+
+    os.makedirs(os.path.dirname(app_data_path), exist_ok=True)
+    shutil.copy(output_path, app_data_path)
+    print(f"📂 Copiado a {app_data_path} para la app.")
+
 
-print("Leyendo datos principales...")
-gdf = gpd.read_parquet(input_path)
-print(f"Total de registros cargados: {len(gdf)}")
-
-print("Leyendo lista de nombres baneados...")
-banned_df = pd.read_excel(banned_path)
-banned_names = set(banned_df.iloc[:, 0].dropna().astype(str).str.strip())
-print(f"Nombres baneados cargados: {len(banned_names)}")
-
-# print("Filtrando registros sin nombre o vacíos...")
-# before = len(gdf)
-# gdf = gdf[gdf['name'].notna() & (gdf['name'].str.strip() != '')]
-# print(f"Registros eliminados por nombre vacío: {before - len(gdf)}")
-
-print("Filtrando registros con nombres baneados...")
-before = len(gdf)
-gdf = gdf[~gdf['name'].astype(str).str.strip().isin(banned_names)]
-print(f"Registros eliminados por estar en la lista de baneo: {before - len(gdf)}")
-
-print(f"Total de registros finales: {len(gdf)}")
-print("Guardando resultado...")
-gdf.to_parquet(output_path, index=False)
-print(f"Archivo guardado en: {output_path}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ import pandas as pd
 import random
 from pathlib import Path
 
+from schema import parquet_columns, unpack_tags
+
 # =====================
 # CONFIGURACIÓN
 # =====================
@@ -143,45 +145,69 @@ def pick_pois_for_profile(profile_name, rules, gdf):
 # PROCESO PRINCIPAL
 # =====================
 
-print("📥 Cargando POIs...")
-gdf = gpd.read_parquet(INPUT_FILE)
-if gdf.crs is None or gdf.crs.to_epsg() != 4326:
-    gdf.set_crs("EPSG:4326", inplace=True, allow_override=True)
+def load_pois(input_file=INPUT_FILE):
+    """
+    Carga los POIs categorizados y convierte polígonos en centroides para la selección.
+    """
+    gdf = gpd.read_parquet(input_file, columns=parquet_columns(input_file))
+    if gdf.crs is None or gdf.crs.to_epsg() != 4326:
+        gdf.set_crs("EPSG:4326", inplace=True, allow_override=True)
+    return prepare_pois(gdf)
+
+
+def prepare_pois(gdf):
+    gdf_ = gdf[gdf['category'].notna()].copy()  # Asegurar que no haya categorías nulas
+    gdf_points = gdf_[gdf_.geometry.type == 'Point'].copy()
+    gdf_polygons = gdf_[gdf_.geometry.type.isin(['Polygon', 'MultiPolygon'])].copy()
+    # In case of polygons, extract the centroid for selection purposes, but it has to be inside the polygon
+    gdf_polygons['geometry'] = gdf_polygons.centroid
+    gdf = pd.concat([gdf_points, gdf_polygons], ignore_index=True)
+    return gpd.GeoDataFrame(gdf, geometry='geometry', crs=gdf_.crs)
+
+
+def generate_sets(gdf, output_base=OUTPUT_BASE, sets_per_profile=SETS_PER_PROFILE, verbose=True):
+    """
+    Genera `sets_per_profile` sets por perfil y los guarda como GeoJSON en
+    {output_base}/{perfil}/{i}.geojson.
+    """
+    output_base.mkdir(parents=True, exist_ok=True)
+
+    for profile, rules in profiles_pois.items():
+        profile_dir = output_base / profile
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        if verbose:
+            print(f"\n➡️ Generando {sets_per_profile} sets para perfil: {profile}")
+
+        for i in range(1, sets_per_profile + 1):
+            selected, warnings = pick_pois_for_profile(profile, rules, gdf)
+            if not selected:
+                print(f"❌ Set {i} para {profile} no se generó (sin datos).")
+                continue
 
-gdf_ = gdf[gdf['category'].notna()].copy()  # Asegurar que no haya categorías nulas
-gdf_points = gdf_[gdf_.geometry.type == 'Point'].copy()
-gdf_polygons = gdf_[gdf_.geometry.type.isin(['Polygon', 'MultiPolygon'])].copy()
-# In case of polygons, extract the centroid for selection purposes, but it has to be inside the polygon
-gdf_polygons['geometry'] = gdf_polygons.centroid
-gdf = pd.concat([gdf_points, gdf_polygons], ignore_index=True)
-gdf = gpd.GeoDataFrame(gdf, geometry='geometry', crs=gdf.crs)
+            # Los tags empaquetados vuelven a propiedades sueltas para el popup de la app
+            subset = gpd.GeoDataFrame([unpack_tags(r) for r in selected], crs=gdf.crs)
+            output_file = profile_dir / f"{i}.geojson"
+            subset.to_file(output_file, driver="GeoJSON")
+            if verbose:
+                print(f"   ✅ Set {i} guardado en {output_file}")
+                for w in warnings:
+                    print(f"      {w}")
 
-OUTPUT_BASE.mkdir(parents=True, exist_ok=True)
 
-for profile, rules in profiles_pois.items():
-    profile_dir = OUTPUT_BASE / profile
-    profile_dir.mkdir(parents=True, exist_ok=True)
-    print(f"\n➡️ Generando {SETS_PER_PROFILE} sets para perfil: {profile}")
+def main():
+    print("📥 Cargando POIs...")
+    gdf = load_pois()
 
-    for i in range(1, SETS_PER_PROFILE + 1):
-        selected, warnings = pick_pois_for_profile(profile, rules, gdf)
-        if not selected:
-            print(f"❌ Set {i} para {profile} no se generó (sin datos).")
-            continue
+    generate_sets(gdf)
 
-        subset = gpd.GeoDataFrame(selected, crs=gdf.crs)
-        output_file = profile_dir / f"{i}.geojson"
-        subset.to_file(output_file, driver="GeoJSON")
-        print(f"   ✅ Set {i} guardado en {output_file}")
-        if warnings:
-            for w in warnings:
-                print(f"      {w}")
+    print("\n🏁 Proceso completado. Revisa la carpeta ./data/places/")
 
-print("\n🏁 Proceso completado. Revisa la carpeta ./data/places/")
+    # Ahora puedes copia ./data/places/ a ./app/static/places/ para que la app lo use.
 
-# Ahora puedes copia ./data/places/ a ./app/static/places/ para que la app lo use.
+    import shutil
+    shutil.copytree(OUTPUT_BASE, Path("./pois_manager/static/places"), dirs_exist_ok=True)
+    print("📂 Copiados los sets a ./pois_manager/static/places/ para la app.")
 
-import shutil
-shutil.copytree(OUTPUT_BASE, Path("./pois_manager/static/places"), dirs_exist_ok=True)
-print("📂 Copiados los sets a ./pois_manager/static/places/ para la app.")
 
+if __name__ == "__main__":
+    main()
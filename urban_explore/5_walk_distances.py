@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Enriquece los sets generados por 4_generate_sets.py con distancias a pie sobre la red vial.
+
+Construye (una sola vez) el grafo peatonal de OSMnx para el ROI y lo guarda en GraphML,
+ubica cada POI en su nodo más cercano en una pasada vectorizada, y calcula las distancias
+de red entre los POIs de cada set con Dijkstra multi-origen (scipy.sparse.csgraph).
+Las distancias entre pares de nodos se memorizan en un Parquet persistente (ligado al
+hash del GraphML que las produjo), así que re-ejecutar solo calcula los pares nuevos.
+
+Salida: ./data/places_walk_metrics.parquet (+ .csv) con distancia/tiempo total y máximo por set.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import osmnx as ox
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+# =====================
+# CONFIGURACIÓN
+# =====================
+
+INPUT_ROI_FILE = "./pois_manager/static/geometries/area_mobility_workshop.geojson"
+PLACES_DIR = Path("./data/places")
+GRAPH_FILE = Path("./data/walk_graph.graphml")
+DISTANCE_CACHE_FILE = Path("./data/walk_distances_cache.parquet")
+OUTPUT_PARQUET = Path("./data/places_walk_metrics.parquet")
+OUTPUT_CSV = Path("./data/places_walk_metrics.csv")
+
+WALK_SPEED_M_PER_MIN = 75.0   # ~4.5 km/h
+SOURCES_PER_BATCH = 256       # orígenes por llamada a dijkstra (acota la memoria)
+
+# =====================
+# FUNCIONES
+# =====================
+
+def load_walk_graph():
+    """
+    Carga el grafo peatonal desde GraphML o lo descarga para el ROI y lo guarda.
+    """
+    if GRAPH_FILE.exists():
+        print(f"📥 Cargando grafo peatonal desde {GRAPH_FILE}")
+        return ox.load_graphml(GRAPH_FILE)
+
+    print("🌐 Descargando grafo peatonal del ROI (solo la primera vez)...")
+    roi = gpd.read_file(INPUT_ROI_FILE).to_crs("EPSG:4326")
+    G = ox.graph_from_polygon(roi.union_all(), network_type="walk")
+    GRAPH_FILE.parent.mkdir(parents=True, exist_ok=True)
+    ox.save_graphml(G, GRAPH_FILE)
+    print(f"💾 Grafo guardado en {GRAPH_FILE}")
+    return G
+
+
+def graph_to_csr(G):
+    """
+    Convierte el grafo en una matriz dispersa de longitudes (m) y un mapeo nodo -> índice.
+    Entre aristas paralelas se conserva la más corta.
+    """
+    nodes = np.fromiter(G.nodes, dtype=np.int64, count=G.number_of_nodes())
+    node_pos = pd.Series(np.arange(len(nodes)), index=nodes)
+
+    edges = pd.DataFrame(list(G.edges(data="length")), columns=["u", "v", "length"])
+    edges = edges.groupby(["u", "v"], as_index=False)["length"].min()
+
+    matrix = csr_matrix(
+        (edges["length"].to_numpy(), (node_pos[edges["u"]].to_numpy(), node_pos[edges["v"]].to_numpy())),
+        shape=(len(nodes), len(nodes)),
+    )
+    return matrix, node_pos
+
+
+def read_sets():
+    """
+    Lee todos los sets como tabla (profile, set_id, order, lon, lat) leyendo el JSON
+    directamente, que es mucho más rápido que abrir cada archivo con GeoPandas.
+    """
+    rows = []
+    for path in PLACES_DIR.glob("*/*.geojson"):
+        with open(path, encoding="utf-8") as f:
+            features = json.load(f)["features"]
+        for order, feature in enumerate(features):
+            lon, lat = feature["geometry"]["coordinates"][:2]
+            rows.append((path.parent.name, int(path.stem), order, lon, lat))
+    return pd.DataFrame(rows, columns=["profile", "set_id", "order", "lon", "lat"])
+
+
+def graph_fingerprint(path=GRAPH_FILE):
+    """
+    Hash del GraphML: las distancias en caché solo valen para el grafo que las produjo.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:24]
+
+
+def load_distance_cache(fingerprint):
+    """
+    Carga la caché de distancias; se descarta si fue calculada con otro grafo.
+    """
+    if not DISTANCE_CACHE_FILE.exists():
+        return {}
+    table = pq.read_table(DISTANCE_CACHE_FILE)
+    metadata = table.schema.metadata or {}
+    if metadata.get(b"graph_fingerprint", b"").decode() != fingerprint:
+        print("♻️ La caché de distancias corresponde a otro grafo, se descarta")
+        return {}
+    cache = table.to_pandas()
+    return dict(zip(zip(cache["u"], cache["v"]), cache["length_m"]))
+
+
+def save_distance_cache(cache, fingerprint):
+    DISTANCE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    pairs = np.array(list(cache.keys()), dtype=np.int64).reshape(-1, 2)
+    table = pa.table({
+        "u": pairs[:, 0],
+        "v": pairs[:, 1],
+        "length_m": np.fromiter(cache.values(), dtype=np.float64, count=len(cache)),
+    })
+    table = table.replace_schema_metadata({"graph_fingerprint": fingerprint})
+    pq.write_table(table, DISTANCE_CACHE_FILE)
+
+
+def compute_missing_distances(pairs, matrix, node_pos, cache):
+    """
+    Calcula las distancias de red de los pares (u, v) que no están en caché,
+    agrupando por nodo de origen para resolverlos con dijkstra multi-origen.
+    """
+    missing = pairs[[(u, v) not in cache for u, v in zip(pairs["u"], pairs["v"])]]
+    if missing.empty:
+        print("✅ Todas las distancias estaban en caché")
+        return
+    print(f"🧮 Calculando {len(missing)} distancias nuevas...")
+
+    by_source = missing.groupby("u")["v"].apply(np.asarray)
+    sources = by_source.index.to_numpy()
+    for start in range(0, len(sources), SOURCES_PER_BATCH):
+        batch = sources[start:start + SOURCES_PER_BATCH]
+        dist = dijkstra(matrix, directed=True, indices=node_pos[batch].to_numpy())
+        for row, u in enumerate(batch):
+            targets = by_source[u]
+            lengths = dist[row, node_pos[targets].to_numpy()]
+            for v, length in zip(targets, lengths):
+                cache[(u, v)] = float(length)
+
+
+def set_pairs(sets):
+    """
+    Todos los pares (u, v) de POIs dentro de cada set, con u antes que v en el orden del set.
+    """
+    left = sets[["profile", "set_id", "order", "node"]]
+    pairs = left.merge(left, on=["profile", "set_id"], suffixes=("_u", "_v"))
+    pairs = pairs[pairs["order_u"] < pairs["order_v"]]
+    return pairs.rename(columns={"node_u": "u", "node_v": "v"})
+
+
+def set_metrics(sets, pairs, cache):
+    """
+    Calcula por set: distancia recorriendo los POIs en orden (total) y el par más
+    lejano (máxima), en metros y minutos a pie.
+    """
+    pairs = pairs.assign(length_m=[cache[(u, v)] for u, v in zip(pairs["u"], pairs["v"])])
+    keys = ["profile", "set_id"]
+    legs = pairs[pairs["order_v"] == pairs["order_u"] + 1]
+
+    # Sets de un solo POI no tienen pares: distancia 0
+    metrics = pd.DataFrame({
+        "n_pois": sets.groupby(keys).size(),
+        "walk_total_m": legs.groupby(keys)["length_m"].sum(),
+        "walk_max_m": pairs.groupby(keys)["length_m"].max(),
+    }).fillna(0.0).reset_index()
+    metrics["walk_total_min"] = metrics["walk_total_m"] / WALK_SPEED_M_PER_MIN
+    metrics["walk_max_min"] = metrics["walk_max_m"] / WALK_SPEED_M_PER_MIN
+    return metrics
+
+
+# =====================
+# PROCESO PRINCIPAL
+# =====================
+
+def main():
+    print("🚶 Iniciando cálculo de distancias a pie por set...")
+
+    sets = read_sets()
+    if sets.empty:
+        raise FileNotFoundError(f"No hay sets en {PLACES_DIR}. Ejecuta primero 4_generate_sets.py")
+    print(f"✅ {sets[['profile', 'set_id']].drop_duplicates().shape[0]} sets, {len(sets)} POIs")
+
+    G = load_walk_graph()
+    matrix, node_pos = graph_to_csr(G)
+
+    # Snap vectorizado: una sola llamada para todas las coordenadas únicas
+    coords = sets[["lon", "lat"]].drop_duplicates()
+    coords["node"] = ox.distance.nearest_nodes(G, coords["lon"].to_numpy(), coords["lat"].to_numpy())
+    sets = sets.merge(coords, on=["lon", "lat"], how="left")
+
+    pairs = set_pairs(sets)
+
+    fingerprint = graph_fingerprint()
+    cache = load_distance_cache(fingerprint)
+    compute_missing_distances(pairs[["u", "v"]].drop_duplicates(), matrix, node_pos, cache)
+    save_distance_cache(cache, fingerprint)
+
+    metrics = set_metrics(sets, pairs, cache)
+    unreachable = np.isinf(metrics["walk_max_m"]).sum()
+    if unreachable:
+        print(f"⚠️ {unreachable} sets tienen POIs sin conexión peatonal entre sí")
+
+    metrics.to_parquet(OUTPUT_PARQUET, index=False)
+    metrics.to_csv(OUTPUT_CSV, index=False)
+
+    print("\n📊 Distancia total a pie por perfil (mediana, m):")
+    for profile, value in metrics.groupby("profile")["walk_total_m"].median().items():
+        print(f"   {profile}: {value:.0f}")
+    print(f"\n🏁 Métricas guardadas en {OUTPUT_PARQUET} y {OUTPUT_CSV}")
+
+
+if __name__ == "__main__":
+    main()
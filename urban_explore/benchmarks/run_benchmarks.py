@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las etapas del pipeline de POIs sobre datos sintéticos.
+
+Mide tiempo (mejor de N repeticiones) y memoria pico de cada etapa: RSS del proceso
+(muestreado con psutil, incluye lo que reservan GEOS, GDAL/pyogrio y Arrow) y
+asignaciones Python/numpy (tracemalloc):
+assign_category, narrow_schema, filter_by_roi, filtro de baneados, pick_pois_for_profile y los
+exportadores (GPKG/GeoJSON/Parquet de 1_transform_pois.py y GeoJSON de sets de
+4_generate_sets.py). Los resultados se guardan en JSON para comparar entre corridas.
+
+Uso (desde urban_explore/):
+    python benchmarks/run_benchmarks.py --sizes 10000 100000 1000000
+    python benchmarks/run_benchmarks.py --sizes 10000 --compare benchmarks/results/anterior.json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+import psutil
+
+from synthetic_pois import synthetic_pois, synthetic_roi
+
+PIPELINE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PIPELINE_DIR))
+
+from schema import narrow_schema  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def load_stage(filename):
+    """Importa un script del pipeline (sus nombres empiezan con dígito)."""
+    path = PIPELINE_DIR / filename
+    spec = importlib.util.spec_from_file_location(path.stem.lstrip("0123456789_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class RssSampler:
+    """
+    Muestrea el RSS del proceso en un hilo aparte y guarda el pico sobre el valor inicial.
+    A diferencia de tracemalloc, ve la memoria nativa de GEOS, GDAL y Arrow.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak_mb = 0.0
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._peak = max(self._peak, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self._baseline = self._peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._peak = max(self._peak, self.process.memory_info().rss)
+        self.peak_mb = (self._peak - self._baseline) / 1024 ** 2
+
+
+def measure(fn, repeat, track_memory):
+    """
+    Ejecuta `fn` `repeat` veces y devuelve (mejor tiempo en s, RSS pico en MB,
+    pico tracemalloc en MB, resultado). El RSS se muestrea en la primera corrida;
+    tracemalloc se mide en una corrida aparte porque agrega overhead.
+    """
+    best = float("inf")
+    result = None
+    rss_mb = None
+    for i in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            sampler = RssSampler() if track_memory and i == 0 else contextlib.nullcontext()
+            with sampler:
+                start = time.perf_counter()
+                result = fn()
+                best = min(best, time.perf_counter() - start)
+        if track_memory and i == 0:
+            rss_mb = sampler.peak_mb
+
+    py_mb = None
+    if track_memory:
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        py_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+    return best, rss_mb, py_mb, result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=PIPELINE_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat, sets_per_profile, track_memory):
+    transform = load_stage("1_transform_pois.py")
+    ban_filter = load_stage("3_filter_pois.py")
+    sets_stage = load_stage("4_generate_sets.py")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        roi_file = tmp / "roi.geojson"
+        synthetic_roi().to_file(roi_file, driver="GeoJSON")
+        transform.INPUT_ROI_FILE = str(roi_file)
+        transform.OUTPUT_GPKG = str(tmp / "pois_categorizados.gpkg")
+        transform.OUTPUT_GEOJSON = str(tmp / "pois_categorizados.geojson")
+        transform.OUTPUT_PARQUET = str(tmp / "pois_categorizados_filtrados.parquet")
+
+        for n in sizes:
+            print(f"\n📦 Generando {n:,} POIs sintéticos...")
+            gdf = synthetic_pois(n)
+
+            def categorize():
+                category = gdf.apply(transform.assign_category, axis=1)
+                return gdf.assign(category=category.fillna(gdf["main_category"]))
+
+            state = {}
+
+            def record(stage, fn):
+                seconds, rss_mb, py_mb, result = measure(fn, repeat, track_memory)
+                results.append({
+                    "stage": stage,
+                    "n_rows": n,
+                    "seconds": round(seconds, 4),
+                    "rows_per_s": round(n / seconds) if seconds else None,
+                    "peak_rss_mb": round(rss_mb, 1) if rss_mb is not None else None,
+                    "peak_tracemalloc_mb": round(py_mb, 1) if py_mb is not None else None,
+                })
+                mem = f", RSS +{rss_mb:.1f} MB, Python {py_mb:.1f} MB" if rss_mb is not None else ""
+                print(f"   ⏱️ {stage:<24} {seconds:9.3f} s{mem}")
+                return result
+
+            categorized = record("assign_category", categorize)
+            state["categorized"] = record("narrow_schema", lambda: narrow_schema(categorized))
+            state["filtered"] = record("filter_by_roi", lambda: transform.filter_by_roi(state["categorized"]))
+
+            banned = set(state["filtered"]["name"].dropna().sample(frac=0.05, random_state=0).astype(str))
+            state["refined"] = record("filter_banned", lambda: ban_filter.filter_banned(state["filtered"], banned))
+
+            prepared = sets_stage.prepare_pois(state["refined"])
+
+            def pick_all():
+                for profile, rules in sets_stage.profiles_pois.items():
+                    for _ in range(sets_per_profile):
+                        sets_stage.pick_pois_for_profile(profile, rules, prepared)
+
+            record("pick_pois_for_profile", pick_all)
+            record("export_results", lambda: transform.export_results(state["categorized"], state["filtered"]))
+            record("write_set_geojson", lambda: sets_stage.generate_sets(
+                prepared, tmp / "places", sets_per_profile=sets_per_profile, verbose=False))
+
+    return results
+
+
+def compare(results, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    previous = {(r["stage"], r["n_rows"]): r for r in baseline["results"]}
+    print(f"\n📈 Comparación con {baseline_path} (tiempo actual / anterior):")
+    for r in results:
+        old = previous.get((r["stage"], r["n_rows"]))
+        if old and old["seconds"]:
+            ratio = r["seconds"] / old["seconds"]
+            flag = "⚠️" if ratio > 1.1 else "  "
+            print(f"   {flag} {r['stage']:<24} {r['n_rows']:>9,}  x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de POIs con datos sintéticos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Cantidad de POIs por corrida")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeticiones por etapa (se reporta la mejor)")
+    parser.add_argument("--sets-per-profile", type=int, default=20, help="Sets por perfil en las etapas de sets")
+    parser.add_argument("--no-memory", action="store_true", help="No medir memoria pico (más rápido)")
+    parser.add_argument("--output", type=Path, help="Archivo JSON de salida (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="JSON de una corrida anterior para comparar")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.sets_per_profile, not args.no_memory)
+
+    output = args.output or RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "geopandas": gpd.__version__,
+            "repeat": args.repeat,
+            "sets_per_profile": args.sets_per_profile,
+        },
+        "results": results,
+    }, indent=2), encoding="utf-8")
+    print(f"\n💾 Resultados guardados en {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
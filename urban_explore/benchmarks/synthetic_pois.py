@@ -0,0 +1,121 @@
+"""
+Generador de POIs sintéticos con la forma de la salida de OSMnx (0_download_pois.py).
+
+Produce un GeoDataFrame con columnas de tags OSM realistas (amenity, shop, tourism,
+leisure, office, building, landuse, sport, name, main_category), los tags de detalle
+que se empaquetan en `tags` (cuisine, opening_hours, website, addr:*) con valores
+variados, columnas de relleno casi vacías y una mezcla de puntos y polígonos, parte
+dentro y parte fuera de un ROI sintético centrado en Concepción.
+"""
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+CENTER = (-73.05, -36.82)
+ROI_RADIUS_DEG = 0.03
+POLYGON_SHARE = 0.3
+OUTSIDE_SHARE = 0.1
+N_SPARSE_TAGS = 55  # columnas de relleno tag_NN (OSMnx trae cientos casi vacías)
+
+# Valores por tag; None = sin tag. Las probabilidades imitan la frecuencia en OSM
+TAG_VALUES = {
+    "amenity": (["restaurant", "cafe", "university", "school", "pub", "bar", "marketplace",
+                 "gym", "town_square", "fast_food", "bank", "pharmacy", None], 0.45),
+    "shop": (["supermarket", "convenience", "clothes", "bakery", "hairdresser", "kiosk", None], 0.25),
+    "tourism": (["attraction", "museum", "viewpoint", "hotel", None], 0.05),
+    "leisure": (["park", "plaza", "fitness_centre", "playground", "garden", None], 0.08),
+    "office": (["company", "government", "lawyer", "yes", None], 0.06),
+    "building": (["residential", "yes", "commercial", "house", "apartments", None], 0.35),
+    "landuse": (["residential", "commercial", "retail", None], 0.05),
+    "sport": (["fitness", "gymnastics", "soccer", None], 0.03),
+}
+
+# Tags de detalle que van empaquetados en `tags` (PACKED_TAGS de schema.py)
+CUISINES = ["chilean", "pizza", "sushi", "coffee_shop", "burger", "chinese", "peruvian", "sandwich", "empanadas"]
+OPENING_HOURS = [
+    "Mo-Fr 09:00-18:00", "Mo-Sa 10:00-20:00", "24/7", "Mo-Su 12:00-23:00",
+    "Mo-Fr 08:30-13:30,15:00-19:00; Sa 10:00-14:00", "Tu-Su 11:00-22:00",
+]
+STREETS = ["Barros Arana", "O'Higgins", "Freire", "Maipú", "Caupolicán", "Colo Colo", "Aníbal Pinto",
+           "Lincoyán", "Rengo", "Castellón", "Tucapel", "Orompello", "Chacabuco", "Víctor Lamas"]
+
+MAIN_CATEGORIES = [
+    "storefront", "university", "cafe", "grocery_store", "restaurant", "market", "residential",
+    "pub", "tourist_places", "park", "school", "office", "plaza", "gym",
+]
+
+
+def synthetic_roi():
+    """ROI sintético: polígono irregular alrededor del centro, en EPSG:4326."""
+    angles = np.linspace(0, 2 * np.pi, 48, endpoint=False)
+    radii = ROI_RADIUS_DEG * (1 + 0.15 * np.sin(5 * angles))
+    coords = np.column_stack([CENTER[0] + radii * np.cos(angles), CENTER[1] + radii * np.sin(angles)])
+    return gpd.GeoDataFrame({"id": [None]}, geometry=[shapely.Polygon(coords)], crs="EPSG:4326")
+
+
+def _tag_column(rng, values, share, n):
+    present = rng.random(n) < share
+    choices = [v for v in values if v is not None]
+    col = np.full(n, None, dtype=object)
+    col[present] = rng.choice(choices, size=int(present.sum()))
+    return col
+
+
+def _sparse_column(values, present):
+    col = np.full(len(values), None, dtype=object)
+    col[present] = values[present]
+    return col
+
+
+def synthetic_pois(n, seed=0):
+    """
+    Genera `n` POIs sintéticos con tags y geometrías tipo OSM.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Posiciones: la mayoría dentro del ROI, una fracción en un anillo exterior
+    outside = rng.random(n) < OUTSIDE_SHARE
+    radius = np.where(
+        outside,
+        ROI_RADIUS_DEG * rng.uniform(1.2, 1.6, n),
+        ROI_RADIUS_DEG * 0.85 * np.sqrt(rng.random(n)),
+    )
+    angle = rng.uniform(0, 2 * np.pi, n)
+    x = CENTER[0] + radius * np.cos(angle)
+    y = CENTER[1] + radius * np.sin(angle)
+
+    geometry = shapely.points(x, y)
+    is_polygon = rng.random(n) < POLYGON_SHARE
+    # Huellas de edificios de ~10-60 m de lado
+    half = rng.uniform(0.00005, 0.0003, int(is_polygon.sum()))
+    px, py = x[is_polygon], y[is_polygon]
+    geometry[is_polygon] = shapely.box(px - half, py - half, px + half, py + half)
+
+    data = {tag: _tag_column(rng, values, share, n) for tag, (values, share) in TAG_VALUES.items()}
+    data["name"] = np.where(rng.random(n) < 0.6, np.char.add("POI ", np.arange(n).astype(str)), None)
+    data["main_category"] = rng.choice(MAIN_CATEGORIES, size=n)
+    data["element_type"] = np.where(is_polygon, "way", "node")
+    data["osmid"] = np.arange(n, dtype=np.int64) + 1_000_000
+
+    # Tags de detalle con valores variados, para que pack_tags/unpack_tags trabajen
+    # con JSON de tamaño realista
+    data["cuisine"] = _sparse_column(rng.choice(CUISINES, n), rng.random(n) < 0.12)
+    data["opening_hours"] = _sparse_column(rng.choice(OPENING_HOURS, n), rng.random(n) < 0.15)
+    data["website"] = _sparse_column(
+        np.char.add(np.char.add("https://www.poi", np.arange(n).astype(str)), ".cl"), rng.random(n) < 0.08)
+    has_street = rng.random(n) < 0.25
+    data["addr:street"] = _sparse_column(rng.choice(STREETS, n), has_street)
+    data["addr:housenumber"] = _sparse_column(
+        rng.integers(1, 3000, n).astype(str), has_street & (rng.random(n) < 0.85))
+
+    # Relleno: tags sin uso presentes en pocas filas
+    for i in range(N_SPARSE_TAGS):
+        col = np.full(n, None, dtype=object)
+        present = rng.random(n) < 0.02
+        col[present] = f"value_{i}"
+        data[f"tag_{i:02d}"] = col
+
+    return gpd.GeoDataFrame(pd.DataFrame(data), geometry=geometry, crs="EPSG:4326")
+
@@ -53,3 +53,67 @@ def used_uuids(profile: str):
     rows = c.fetchall()
     conn.close()
     return {r[0] for r in rows}
+
+
+def preregister(profile: str, set_paths, uuids=None, count: int = 0):
+    """
+    Asigna sets a muchos uuid de un profile en una sola transacción.
+
+    Los uuid que ya tienen set lo conservan. Si se entrega `count` en vez de
+    `uuids`, se generan uuid numéricos libres igual que en /join.
+    Devuelve una lista de (uuid, set_path) en el orden solicitado y lanza
+    ValueError (sin escribir nada) si no alcanzan los sets libres.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        c = conn.cursor()
+        # IMMEDIATE bloquea escrituras concurrentes de /join mientras repartimos
+        c.execute("BEGIN IMMEDIATE")
+        c.execute("SELECT uuid, set_path FROM assignments WHERE profile=?", (profile,))
+        existing = dict(c.fetchall())
+
+        used = set(existing.values())
+        free_sets = [str(s) for s in set_paths if str(s) not in used]
+
+        # Se valida antes de generar uuid para no retener el lock ni reservar memoria de más
+        if uuids is None:
+            needed = count
+        else:
+            uuids = list(dict.fromkeys(str(u) for u in uuids))
+            needed = sum(1 for u in uuids if u not in existing)
+        if needed > len(free_sets):
+            raise ValueError(
+                f"Ya no quedan sets para '{profile}' "
+                f"({len(free_sets)} libres, {needed} uuid nuevos solicitados)"
+            )
+
+        if uuids is None:
+            usados_enteros = {int(u) for u in existing if u.isdigit()}
+            uuids = []
+            nuevo = 1
+            while len(uuids) < count:
+                if nuevo not in usados_enteros:
+                    uuids.append(str(nuevo))
+                nuevo += 1
+
+        free_iter = iter(free_sets)
+        new_rows = []
+        mapping = []
+        for user_uuid in uuids:
+            set_path = existing.get(user_uuid)
+            if set_path is None:
+                set_path = next(free_iter)
+                new_rows.append((profile, user_uuid, set_path))
+            mapping.append((user_uuid, set_path))
+
+        c.executemany(
+            "INSERT INTO assignments (profile, uuid, set_path) VALUES (?,?,?)",
+            new_rows
+        )
+        conn.commit()
+        return mapping
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -1,11 +1,19 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import RedirectResponse, HTMLResponse
+from fastapi import FastAPI, HTTPException, Request, Header
+from fastapi.responses import RedirectResponse, HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
-from .db import init_db, get_assignment, save_assignment, used_sets, used_uuids
+from .db import init_db, get_assignment, save_assignment, used_sets, used_uuids, preregister
+from .preregister import build_rows, EXPORT_COLUMNS
+from .pois_index import PoiIndex
+from pydantic import BaseModel
+from typing import List, Optional
 from dotenv import load_dotenv
+import csv
+import io
+import json
 import os
+import secrets
 from fastapi.middleware.cors import CORSMiddleware
 
 
@@ -38,18 +46,32 @@ if not MAPBOX_API_KEY:
 
 print(f"✅ Mapbox API Key configurada: {MAPBOX_API_KEY[:10]}...")
 
+# Token para endpoints de administración (pre-registro). Sin token, quedan deshabilitados.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
 # Configuración de directorios
 BASE_DIR = Path(__file__).parent.parent
 SETS_BASE = BASE_DIR / "static" / "places"
 STATIC_DIR = BASE_DIR / "static" 
 TEMPLATES_DIR = BASE_DIR / "templates"
+POIS_FILE = Path(os.getenv("POIS_FILE", BASE_DIR / "data" / "pois_categorizados_filtrados_refinados.parquet"))
+POIS_PAGE_MAX = 1000
+
+# Índice espacial de POIs, se carga en el startup
+poi_index = None
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
 @app.on_event("startup")
 def startup_event():
+    global poi_index
     init_db()
+    if POIS_FILE.exists():
+        poi_index = PoiIndex.from_parquet(POIS_FILE)
+        print(f"📍 {len(poi_index)} POIs cargados en memoria desde {POIS_FILE}")
+    else:
+        print(f"⚠️ No se encontró {POIS_FILE}, /api/pois no estará disponible")
     print(f"🗺️ POIs Manager iniciado - Concepción, Chile")
 
 @app.get("/")
@@ -62,6 +84,7 @@ def health_check():
         "status": "healthy", 
         "location": "Concepción, Chile",
         "mapbox_configured": MAPBOX_API_KEY is not None,
+        "pois_loaded": len(poi_index) if poi_index is not None else 0,
         "profiles": ["student", "elderly", "tourist", "families", "office_worker", "shop_owner"]
     }
 
@@ -96,6 +119,99 @@ def join(profile: str, uuid: str = None):
 
     return RedirectResponse(url=f"/viewer/{profile}/{uuid}")
 
+class PreregisterRequest(BaseModel):
+    uuids: Optional[List[str]] = None
+    count: int = 0
+
+
+@app.post("/api/preregister/{profile}")
+def preregister_bulk(profile: str, body: PreregisterRequest, request: Request, format: str = "json",
+                     x_admin_token: str = Header(None)):
+    """
+    Pre-registra muchos asistentes de un perfil en una sola transacción.
+    Acepta una lista de uuid o una cantidad; con format=csv devuelve el mapeo
+    listo para imprimir links personalizados. Requiere el header X-Admin-Token.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Token de administración inválido")
+    profile_path = SETS_BASE / profile
+    available_sets = sorted(profile_path.glob("*.geojson"))
+    if not available_sets:
+        raise HTTPException(status_code=404, detail=f"No hay sets para '{profile}'")
+    if body.uuids is None and body.count <= 0:
+        raise HTTPException(status_code=400, detail="Debes indicar 'uuids' o 'count'")
+    if body.uuids is None and body.count > len(available_sets):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Se solicitaron {body.count} uuid pero '{profile}' solo tiene {len(available_sets)} sets",
+        )
+
+    try:
+        mapping = preregister(profile, available_sets, uuids=body.uuids, count=body.count)
+    except ValueError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+    rows = build_rows(profile, mapping, str(request.base_url).rstrip("/"))
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+        buffer.seek(0)
+        return StreamingResponse(
+            buffer,
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename={profile}_preregistro.csv"},
+        )
+    return {"profile": profile, "assigned": len(rows), "assignments": rows}
+
+def _parse_floats(value: str, n: int, name: str):
+    try:
+        floats = [float(v) for v in value.split(",")]
+    except ValueError:
+        floats = []
+    if len(floats) != n:
+        raise HTTPException(status_code=400, detail=f"'{name}' debe tener {n} números separados por coma")
+    return floats
+
+@app.get("/api/pois")
+def query_pois(bbox: str = None, category: str = None, near: str = None,
+               k: int = 10, limit: int = 100, offset: int = 0):
+    """
+    Consulta POIs en memoria por bbox (minx,miny,maxx,maxy), categorías
+    (separadas por coma) y/o k vecinos más cercanos a near=lon,lat.
+    Devuelve un FeatureCollection paginado que se envía en streaming.
+    """
+    if poi_index is None:
+        raise HTTPException(status_code=503, detail="POIs no cargados en el servidor")
+    if not 1 <= limit <= POIS_PAGE_MAX or offset < 0 or k < 1:
+        raise HTTPException(status_code=400, detail=f"Parámetros de paginación inválidos (limit máximo {POIS_PAGE_MAX})")
+
+    categories = [c for c in category.split(",") if c] if category else None
+    ids = poi_index.bbox(*_parse_floats(bbox, 4, "bbox"), categories=categories) if bbox else None
+    distances = None
+    if near:
+        lon, lat = _parse_floats(near, 2, "near")
+        ids, distances = poi_index.nearest(lon, lat, k=k, categories=categories, candidates=ids)
+    elif ids is None:
+        mask = poi_index.category_mask(categories)
+        ids = range(len(poi_index)) if mask is None else mask.nonzero()[0]
+
+    total = len(ids)
+    page = range(offset, min(offset + limit, total))
+
+    def stream():
+        yield json.dumps({"type": "FeatureCollection", "total": total, "offset": offset, "limit": limit})[:-1]
+        yield ', "features": ['
+        for n, pos in enumerate(page):
+            dist = distances[pos] if distances is not None else None
+            yield ("," if n else "") + json.dumps(poi_index.feature(ids[pos], dist), ensure_ascii=False)
+        yield "]}"
+
+    return StreamingResponse(stream(), media_type="application/geo+json")
+
 @app.get("/viewer/{profile}/{uuid}")
 def viewer(profile: str, uuid: str, request: Request):
     set_file = get_assignment(profile, uuid)
@@ -0,0 +1,150 @@
+"""
+Índice espacial en memoria sobre el dataset de POIs refinados.
+
+Los POIs se cargan una vez al iniciar la app en arreglos columnares compactos
+(códigos de categoría, coordenadas float32, nombres) más un STRtree de shapely,
+para responder consultas por bbox y k vecinos más cercanos sin tocar disco.
+"""
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+
+METERS_PER_DEGREE = 111_320.0
+
+# CRS aceptados (lon/lat WGS84); la app no reproyecta para no depender de pyproj
+WGS84_IDS = {("EPSG", "4326"), ("OGC", "CRS84")}
+
+
+def _geo_metadata(schema):
+    """Columna de geometría y CRS según los metadatos GeoParquet (clave b"geo")."""
+    geo = json.loads((schema.metadata or {}).get(b"geo", b"{}"))
+    column = geo.get("primary_column", "geometry")
+    # Sin clave "crs" la especificación define OGC:CRS84
+    crs = geo.get("columns", {}).get(column, {}).get("crs", "OGC:CRS84")
+    return column, crs
+
+
+def _is_wgs84(crs):
+    if crs is None:
+        return True  # CRS desconocido: se asume lon/lat como el resto del pipeline
+    if isinstance(crs, str):
+        authority, _, code = crs.upper().partition(":")
+        return (authority, code) in WGS84_IDS
+    crs_id = crs.get("id") or {}
+    return (str(crs_id.get("authority", "")).upper(), str(crs_id.get("code", "")).upper()) in WGS84_IDS
+
+
+def _column_values(table, name):
+    """Columna como arreglo numpy de objetos, decodificando columnas categóricas."""
+    column = table.column(name).combine_chunks()
+    if pa.types.is_dictionary(column.type):
+        column = column.dictionary_decode()
+    return column.to_numpy(zero_copy_only=False)
+
+
+class PoiIndex:
+    def __init__(self, names, categories, lon, lat):
+        cat = np.asarray(categories, dtype=object)
+        self.category_names, codes = np.unique(cat.astype(str), return_inverse=True)
+        self.category_codes = codes.astype(np.int16)
+        self.names = np.asarray(names, dtype=object)
+        self.lon = np.asarray(lon, dtype=np.float32)
+        self.lat = np.asarray(lat, dtype=np.float32)
+        self.tree = shapely.STRtree(shapely.points(self.lon, self.lat))
+        # Corrección de longitud para distancias aproximadas en grados
+        self.lon_scale = math.cos(math.radians(float(np.mean(self.lat)))) if len(self.lat) else 1.0
+
+    @classmethod
+    def from_parquet(cls, path: Path):
+        geometry_column, crs = _geo_metadata(pq.read_schema(path))
+        if not _is_wgs84(crs):
+            raise ValueError(f"{path} debe estar en EPSG:4326 (CRS encontrado: {crs})")
+
+        table = pq.read_table(path, columns=["name", "category", geometry_column])
+        geometry = shapely.from_wkb(_column_values(table, geometry_column))
+        category = _column_values(table, "category")
+        names = _column_values(table, "name")
+        keep = ~(shapely.is_missing(geometry) | (category == None))  # noqa: E711
+        # Polígonos se representan con un punto interior
+        points = shapely.point_on_surface(geometry[keep])
+        names = np.where(names[keep] == None, "", names[keep])  # noqa: E711
+        return cls(names, category[keep], shapely.get_x(points), shapely.get_y(points))
+
+    def __len__(self):
+        return len(self.lon)
+
+    def category_mask(self, categories):
+        """Máscara booleana de POIs cuyas categorías estén en `categories` (None = todas)."""
+        if not categories:
+            return None
+        wanted = np.flatnonzero(np.isin(self.category_names, list(categories)))
+        return np.isin(self.category_codes, wanted)
+
+    def bbox(self, minx, miny, maxx, maxy, categories=None):
+        """Índices de los POIs dentro del bbox, ordenados."""
+        ids = np.sort(self.tree.query(shapely.box(minx, miny, maxx, maxy)))
+        mask = self.category_mask(categories)
+        return ids if mask is None else ids[mask[ids]]
+
+    def nearest(self, lon, lat, k=10, categories=None, candidates=None):
+        """
+        Índices y distancias (m) de los k POIs más cercanos a (lon, lat).
+
+        Sin `candidates` usa el STRtree agrandando la ventana de búsqueda hasta
+        tener k candidatos, y luego una última consulta con el radio del k-ésimo
+        para garantizar el resultado exacto.
+        """
+        mask = self.category_mask(categories)
+        if candidates is None:
+            n_total = len(self) if mask is None else int(mask.sum())
+            k = min(k, n_total)
+            if k == 0:
+                return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+            radius = 0.002
+            while True:
+                candidates = self._window(lon, lat, radius, mask)
+                if len(candidates) >= k:
+                    break
+                radius *= 4
+            dist = self._distances(lon, lat, candidates)
+            kth = np.partition(dist, k - 1)[k - 1]
+            # La ventana es un cuadrado; el k-ésimo puede estar fuera del círculo inscrito
+            if kth > radius:
+                candidates = self._window(lon, lat, kth, mask)
+        elif mask is not None:
+            candidates = candidates[mask[candidates]]
+
+        dist = self._distances(lon, lat, candidates)
+        k = min(k, len(candidates))
+        top = np.argpartition(dist, k - 1)[:k] if k else np.empty(0, dtype=np.intp)
+        top = top[np.argsort(dist[top])]
+        return candidates[top], dist[top] * METERS_PER_DEGREE
+
+    def feature(self, i, distance_m=None):
+        properties = {
+            "name": self.names[i],
+            "category": self.category_names[self.category_codes[i]],
+        }
+        if distance_m is not None:
+            properties["distance_m"] = round(float(distance_m), 1)
+        return {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [float(self.lon[i]), float(self.lat[i])]},
+            "properties": properties,
+        }
+
+    def _window(self, lon, lat, radius, mask):
+        dlon = radius / self.lon_scale
+        ids = self.tree.query(shapely.box(lon - dlon, lat - radius, lon + dlon, lat + radius))
+        return ids if mask is None else ids[mask[ids]]
+
+    def _distances(self, lon, lat, ids):
+        dx = (self.lon[ids].astype(np.float64) - lon) * self.lon_scale
+        dy = self.lat[ids].astype(np.float64) - lat
+        return np.hypot(dx, dy)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pre-registro masivo: asigna sets a N asistentes por perfil en una sola transacción
+y exporta el mapeo uuid -> set -> link personalizado en CSV o Parquet.
+
+Uso (dentro del contenedor):
+    python -m src.preregister student --count 300 --output data/student.csv
+    python -m src.preregister elderly --uuids-file asistentes.txt --output data/elderly.parquet
+"""
+
+import argparse
+import csv
+from pathlib import Path
+
+from . import db
+
+BASE_URL = "https://mobility-concepcion-workshop.up.railway.app"
+SETS_BASE = Path(__file__).parent.parent / "static" / "places"
+EXPORT_COLUMNS = ["profile", "uuid", "set_path", "url"]
+
+
+def build_rows(profile: str, mapping, base_url: str = BASE_URL):
+    """
+    Convierte la lista (uuid, set_path) en filas listas para exportar.
+    """
+    return [
+        {
+            "profile": profile,
+            "uuid": user_uuid,
+            "set_path": set_path,
+            "url": f"{base_url}/viewer/{profile}/{user_uuid}",
+        }
+        for user_uuid, set_path in mapping
+    ]
+
+
+def export_rows(rows, output_path: Path):
+    """
+    Exporta las filas a CSV o Parquet según la extensión del archivo.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if output_path.suffix == ".parquet":
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise RuntimeError("Exportar a Parquet requiere pandas y pyarrow instalados") from e
+        pd.DataFrame(rows, columns=EXPORT_COLUMNS).to_parquet(output_path, index=False)
+        return
+
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-registro masivo de asistentes por perfil")
+    parser.add_argument("profile", help="Perfil al que se asignan los sets (ej: student)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--count", type=int, help="Cantidad de uuid numéricos a generar")
+    group.add_argument("--uuids-file", type=Path, help="Archivo de texto con un uuid por línea")
+    parser.add_argument("--output", type=Path, required=True, help="Archivo de salida (.csv o .parquet)")
+    parser.add_argument("--base-url", default=BASE_URL, help="URL base para los links personalizados")
+    parser.add_argument("--db", type=Path, default=db.DB_PATH, help="Ruta a assignments.db")
+    args = parser.parse_args()
+
+    db.DB_PATH = args.db
+    db.init_db()
+
+    profile_path = SETS_BASE / args.profile
+    set_paths = sorted(profile_path.glob("*.geojson"))
+    if not set_paths:
+        raise SystemExit(f"❌ No hay sets para '{args.profile}' en {profile_path}")
+
+    uuids = None
+    if args.uuids_file:
+        lines = args.uuids_file.read_text(encoding="utf-8").splitlines()
+        uuids = [line.strip() for line in lines if line.strip()]
+
+    try:
+        mapping = db.preregister(args.profile, set_paths, uuids=uuids, count=args.count or 0)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+
+    export_rows(build_rows(args.profile, mapping, args.base_url), args.output)
+    print(f"✅ {len(mapping)} asistentes pre-registrados para '{args.profile}'")
+    print(f"📄 Mapeo exportado en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Esquema reducido de POIs usado desde 1_transform_pois.py en adelante.
+
+OSMnx entrega cientos de columnas de tags casi vacías. Después de categorizar solo se
+conservan las columnas de KEPT_COLUMNS: los tags útiles se empaquetan como JSON compacto
+en una sola columna `tags` y category/main_category pasan a dtype categórico.
+"""
+
+import json
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Tags OSM que usan las reglas de categorización
+RULE_TAGS = ["amenity", "shop", "tourism", "leisure", "office", "building", "landuse", "sport"]
+
+# Tags que se conservan empaquetados (los de las reglas + los que muestra el popup de la app)
+PACKED_TAGS = RULE_TAGS + ["cuisine", "opening_hours", "website", "addr:street", "addr:housenumber"]
+
+CATEGORICAL_COLUMNS = ["category", "main_category"]
+KEPT_COLUMNS = ["name", "category", "main_category", "tags", "geometry"]
+
+# Columnas a leer del pois.gpkg crudo
+SOURCE_COLUMNS = ["name", "main_category"] + PACKED_TAGS
+
+
+def parquet_columns(path, columns=KEPT_COLUMNS):
+    """
+    Columnas de `columns` presentes en el Parquet, para leer con proyección también
+    archivos generados antes de este esquema (sin `tags`).
+    """
+    names = set(pq.read_schema(path).names)
+    return [c for c in columns if c in names]
+
+
+def pack_tags(df, tags=PACKED_TAGS):
+    """
+    Empaqueta los tags presentes de cada fila en un string JSON compacto (None si no hay).
+    """
+    present = [t for t in tags if t in df.columns]
+    if not present:
+        return pd.Series(None, index=df.index, dtype=object)
+
+    sub = df[present].astype(object)
+    sub = sub.where(sub.notna(), None)
+    packed = [
+        json.dumps({k: v for k, v in zip(present, row) if v is not None}, ensure_ascii=False, separators=(",", ":"))
+        if any(v is not None for v in row) else None
+        for row in sub.itertuples(index=False, name=None)
+    ]
+    return pd.Series(packed, index=df.index, dtype=object)
+
+
+def apply_schema(gdf):
+    """
+    Deja solo las columnas de KEPT_COLUMNS presentes y aplica dtype categórico.
+    """
+    gdf = gdf[[c for c in KEPT_COLUMNS if c in gdf.columns]].copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in gdf.columns:
+            gdf[col] = gdf[col].astype("category")
+    return gdf
+
+
+def narrow_schema(gdf):
+    """
+    Empaqueta los tags y reduce un GeoDataFrame ancho de OSMnx al esquema reducido.
+    """
+    gdf = gdf.copy() if "name" in gdf.columns else gdf.assign(name=None)
+    gdf["tags"] = pack_tags(gdf)
+    return apply_schema(gdf)
+
+
+def unpack_tags(record):
+    """
+    Expande la columna `tags` de un registro (dict) en propiedades sueltas.
+    """
+    tags = record.pop("tags", None)
+    if tags:
+        for key, value in json.loads(tags).items():
+            record.setdefault(key, value)
+    return record
+
+
+def decategorize(gdf):
+    """
+    Convierte columnas categóricas a object para drivers (GPKG/GeoJSON) que no las soportan.
+    """
+    cat_cols = [c for c in gdf.columns if isinstance(gdf[c].dtype, pd.CategoricalDtype)]
+    return gdf.astype({c: object for c in cat_cols}) if cat_cols else gdf